@@ -10,16 +10,25 @@ import time
 import traceback
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from urllib.parse import parse_qs, urlencode, urlparse
 
 import httpx
 import supabase
+from postgrest.exceptions import APIError
 
 import qrcode
 from fastapi import Body, Depends, FastAPI, File, Form, HTTPException, Query, Request, UploadFile, status
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
@@ -28,6 +37,7 @@ from app.auth import get_current_staff
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.background import BackgroundTask
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import (
@@ -54,8 +64,8 @@ from app.display import (
     display_note_category,
     display_payment_method,
 )
-from app.r2 import r2_upload, r2_download
-from app.supabase_client import SupabaseDB
+from app.r2 import r2_upload, r2_stream
+from app.supabase_client import Row, SupabaseDB
 from app.database import get_db
 from app.i18n import get_translations
 from app.schemas import OrderSummaryResponse, PricePreviewResponse
@@ -65,7 +75,8 @@ from app.services.cash_closing import (
     COIN_BILL_DENOMS,
     build_cash_closing_fields,
     create_cash_closing_audit,
-    ensure_unique_cash_closing_type,
+    ensure_no_duplicate_cash_closing,
+    fetch_cash_closing_snapshot,
     parse_cash_closing_type,
     parse_denomination_counts,
 )
@@ -73,6 +84,7 @@ from app.services.completion_messages import (
     SUCCESS_PRIMARY_MESSAGE_KEYS,
     SUCCESS_SECONDARY_MESSAGE_KEYS,
     build_completion_messages_from_ko,
+    invalidate_completion_messages_cache,
     load_completion_messages,
 )
 from app.services.flying_pass import (
@@ -89,7 +101,7 @@ from app.services.retention import run_retention_cleanup
 from app.services.sales import (
     build_sales_analytics,
     summarize_order_pass_discount_for_date,
-    summarize_order_sales_for_date,
+    summarize_order_sales_and_discount_for_date,
 )
 from app.services.storage import calculate_storage_days, validate_pickup_time_window
 from app.utils import (
@@ -242,7 +254,33 @@ def generate_qr_base64(data: str) -> str:
 
 
 def ensure_staff(request: Request, db: SupabaseDB):
-    return get_current_staff(request, db)
+    # Memoized per request so dependencies and handlers share one profile fetch
+    staff = getattr(request.state, "staff", None)
+    if staff is None:
+        staff = get_current_staff(request, db)
+        request.state.staff = staff
+    return staff
+
+
+def get_order_or_404(
+    request: Request,
+    order_id: str,
+    db: SupabaseDB = Depends(get_db),
+) -> Row:
+    """Path dependency shared by the staff order endpoints: auth check, then
+    one order fetch per request (404 if missing), memoized on request.state."""
+    ensure_staff(request, db)
+    cache = getattr(request.state, "orders", None)
+    if cache is None:
+        cache = {}
+        request.state.orders = cache
+    order = cache.get(order_id)
+    if order is None:
+        order = db.get("orders", "order_id", order_id)
+        if order is None:
+            raise HTTPException(status_code=404, detail="Order not found")
+        cache[order_id] = order
+    return order
 
 
 def build_staff_menu(db: SupabaseDB, active_key: str, is_admin: bool = False) -> list[dict[str, object]]:
@@ -377,6 +415,7 @@ def log_activity(
     })
 
 
+@lru_cache(maxsize=256)
 def build_staff_accounts_redirect(
     *,
     msg: str = "",
@@ -395,9 +434,30 @@ def build_staff_accounts_redirect(
     return "/staff/admin/staff-accounts"
 
 
+# The schedule toggle changes rarely but build_staff_menu reads it on every
+# staff page render; cache it briefly and invalidate when an admin saves it.
+_SCHEDULE_FLAG_TTL_SECONDS = 30.0
+_schedule_flag_cached: Optional[bool] = None
+_schedule_flag_expires_at = 0.0
+
+
+def invalidate_schedule_flag_cache() -> None:
+    global _schedule_flag_cached, _schedule_flag_expires_at
+    _schedule_flag_cached = None
+    _schedule_flag_expires_at = 0.0
+
+
 def is_schedule_feature_enabled(db: SupabaseDB) -> bool:
+    global _schedule_flag_cached, _schedule_flag_expires_at
+    now = time.monotonic()
+    if _schedule_flag_cached is not None and now < _schedule_flag_expires_at:
+        return _schedule_flag_cached
+
     value = get_app_setting(db, SCHEDULE_FEATURE_ENABLED_KEY, "1")
-    return value.lower() not in {"0", "false", "off", "no"}
+    enabled = value.lower() not in {"0", "false", "off", "no"}
+    _schedule_flag_cached = enabled
+    _schedule_flag_expires_at = now + _SCHEDULE_FLAG_TTL_SECONDS
+    return enabled
 
 
 def normalize_schedule_embed_url(raw_value: str) -> str:
@@ -781,10 +841,14 @@ def build_cash_closing_context(
         default_closing_type = "FINAL_CLOSE"
     else:
         default_closing_type = "FINAL_CLOSE"
-    today_sales = summarize_order_sales_for_date(db, today)
+    today_sales = summarize_order_sales_and_discount_for_date(db, today)
     closing_dates = {row.business_date for row in closings}
+    # Today's discount comes with the sales summary; other dates still need
+    # their own lookup
     pass_discount_by_date = {
-        business_date: summarize_order_pass_discount_for_date(db, business_date)
+        business_date: today_sales["pass_discount_total"]
+        if business_date == today
+        else summarize_order_pass_discount_for_date(db, business_date)
         for business_date in closing_dates
     }
 
@@ -864,6 +928,8 @@ def on_startup() -> None:
 
     threading.Thread(target=_extension_catchup, daemon=True).start()
 
+    threading.Thread(target=_audit_log_flusher, daemon=True).start()
+
     threading.Thread(
         target=_daily_scheduler,
         args=(3, "Retention cleanup", run_retention_cleanup),
@@ -1024,7 +1090,11 @@ def customer_success(
     lang: str = "ko",
     db: SupabaseDB = Depends(get_db),
 ) -> HTMLResponse:
-    order = db.get("orders", "order_id", order_id)
+    # The success page only renders the amount and two timestamps
+    order = db.get(
+        "orders", "order_id", order_id,
+        select="order_id,prepaid_amount,created_at,expected_pickup_at",
+    )
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
 
@@ -1624,53 +1694,69 @@ def staff_cash_closing_create(
 
     _ = business_date_range_utc(business_date)
     normalized_closing_type = parse_cash_closing_type(closing_type)
-    existing_row = (
-        db.query("cash_closings")
-        .filter(
-            ("business_date", "=", business_date),
-            ("closing_type", "=", normalized_closing_type),
-        )
-        .first()
-    )
-    if existing_row is not None:
-        return RedirectResponse(
-            url=f"/staff/cash-closing?edit_id={existing_row.closing_id}",
-            status_code=status.HTTP_303_SEE_OTHER,
-        )
 
     counts = parse_denomination_counts(
         count_10000, count_5000, count_2000, count_1000, count_500,
         count_100, count_50, count_10, count_5, count_1,
     )
-    computed = build_cash_closing_fields(counts, actual_qr_amount, db, business_date)
-
-    row = db.insert("cash_closings", {
-        "business_date": business_date,
-        "closing_type": normalized_closing_type,
-        "workflow_status": "DRAFT",
-        "count_10000": count_10000,
-        "count_5000": count_5000,
-        "count_2000": count_2000,
-        "count_1000": count_1000,
-        "count_500": count_500,
-        "count_100": count_100,
-        "count_50": count_50,
-        "count_10": count_10,
-        "count_5": count_5,
-        "count_1": count_1,
-        **computed,
-        "submitted_by_staff_id": None,
-        "submitted_at": None,
-        "verified_by_staff_id": None,
-        "verified_at": None,
-        "check_cash_match": False,
-        "check_qr_match": False,
-        "check_pending_items": False,
-        "check_handover_note": False,
-        "owner_name": owner_name.strip() or staff.name,
-        "note": note.strip() or None,
-        "staff_id": staff.staff_id,
-    })
+    snapshot = fetch_cash_closing_snapshot(db, business_date, normalized_closing_type)
+    if snapshot.get("existing_closing_id"):
+        return RedirectResponse(
+            url=f"/staff/cash-closing?edit_id={snapshot['existing_closing_id']}",
+            status_code=status.HTTP_303_SEE_OTHER,
+        )
+    computed = build_cash_closing_fields(counts, actual_qr_amount, snapshot)
+
+    try:
+        row = db.insert("cash_closings", {
+            "business_date": business_date,
+            "closing_type": normalized_closing_type,
+            "workflow_status": "DRAFT",
+            "count_10000": count_10000,
+            "count_5000": count_5000,
+            "count_2000": count_2000,
+            "count_1000": count_1000,
+            "count_500": count_500,
+            "count_100": count_100,
+            "count_50": count_50,
+            "count_10": count_10,
+            "count_5": count_5,
+            "count_1": count_1,
+            **computed,
+            "submitted_by_staff_id": None,
+            "submitted_at": None,
+            "verified_by_staff_id": None,
+            "verified_at": None,
+            "check_cash_match": False,
+            "check_qr_match": False,
+            "check_pending_items": False,
+            "check_handover_note": False,
+            "owner_name": owner_name.strip() or staff.name,
+            "note": note.strip() or None,
+            "staff_id": staff.staff_id,
+        })
+    except APIError as exc:
+        # Unique index on (business_date, closing_type): a closing already
+        # exists, so send the staff to its edit form like before.
+        if exc.code != "23505":
+            raise
+        existing_row = (
+            db.query("cash_closings")
+            .filter(
+                ("business_date", "=", business_date),
+                ("closing_type", "=", normalized_closing_type),
+            )
+            .first()
+        )
+        if existing_row is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"해당 날짜({business_date})의 {normalized_closing_type} 정산이 이미 존재합니다.",
+            ) from exc
+        return RedirectResponse(
+            url=f"/staff/cash-closing?edit_id={existing_row.closing_id}",
+            status_code=status.HTTP_303_SEE_OTHER,
+        )
     create_cash_closing_audit(
         db,
         row,
@@ -1717,8 +1803,9 @@ def staff_cash_closing_update(
 
     _ = business_date_range_utc(business_date)
     normalized_closing_type = parse_cash_closing_type(closing_type)
-    ensure_unique_cash_closing_type(
-        db,
+    snapshot = fetch_cash_closing_snapshot(db, business_date, normalized_closing_type)
+    ensure_no_duplicate_cash_closing(
+        snapshot,
         business_date,
         normalized_closing_type,
         exclude_closing_id=closing_id,
@@ -1742,7 +1829,7 @@ def staff_cash_closing_update(
         count_10000, count_5000, count_2000, count_1000, count_500,
         count_100, count_50, count_10, count_5, count_1,
     )
-    computed = build_cash_closing_fields(counts, actual_qr_amount, db, business_date)
+    computed = build_cash_closing_fields(counts, actual_qr_amount, snapshot)
 
     row.business_date = business_date
     row.closing_type = normalized_closing_type
@@ -1803,28 +1890,11 @@ def staff_cash_closing_submit(
     if row.workflow_status == "LOCKED":
         raise HTTPException(status_code=400, detail="이미 잠금된 정산입니다.")
 
-    row.workflow_status = "SUBMITTED"
-    row.submitted_by_staff_id = staff.staff_id
-    row.submitted_at = utc_now()
-    row.verified_by_staff_id = None
-    row.verified_at = None
-    row.check_cash_match = False
-    row.check_qr_match = False
-    row.check_pending_items = False
-    row.check_handover_note = False
-    row.staff_id = staff.staff_id
-
-    create_cash_closing_audit(
-        db,
-        row,
-        action="SUBMIT",
-        staff_id=staff.staff_id,
-        payload={
-            "workflow_status": row.workflow_status,
-            "submitted_by_staff_id": row.submitted_by_staff_id,
-        },
-    )
-    db.update(row)
+    # Single RPC updates the row and writes the SUBMIT audit atomically
+    db.client.rpc(
+        "submit_cash_closing",
+        {"p_closing_id": closing_id, "p_staff_id": staff.staff_id},
+    ).execute()
     return RedirectResponse(url="/staff/cash-closing", status_code=status.HTTP_303_SEE_OTHER)
 
 
@@ -1858,28 +1928,11 @@ def staff_cash_closing_verify_lock(
     if not all(checks.values()):
         raise HTTPException(status_code=400, detail="체크리스트를 모두 확인해야 잠금할 수 있습니다.")
 
-    row.check_cash_match = True
-    row.check_qr_match = True
-    row.check_pending_items = True
-    row.check_handover_note = True
-    row.workflow_status = "LOCKED"
-    row.verified_by_staff_id = staff.staff_id
-    row.verified_at = utc_now()
-    row.staff_id = staff.staff_id
-
-    create_cash_closing_audit(
-        db,
-        row,
-        action="VERIFY_LOCK",
-        staff_id=staff.staff_id,
-        payload={
-            "workflow_status": row.workflow_status,
-            "submitted_by_staff_id": row.submitted_by_staff_id,
-            "verified_by_staff_id": row.verified_by_staff_id,
-            **checks,
-        },
-    )
-    db.update(row)
+    # Single RPC updates the row and writes the VERIFY_LOCK audit atomically
+    db.client.rpc(
+        "verify_lock_cash_closing",
+        {"p_closing_id": closing_id, "p_staff_id": staff.staff_id},
+    ).execute()
     return RedirectResponse(url=f"/staff/cash-closing/{closing_id}", status_code=status.HTTP_303_SEE_OTHER)
 
 
@@ -1896,14 +1949,25 @@ def staff_cash_closing_detail(
 
     audits = (
         db.query("cash_closing_audits")
+        .select("*,user_profiles!staff_id(id,username)")
         .filter(("closing_id", "=", row.closing_id))
         .order_by("created_at DESC", "audit_id DESC")
         .limit(60)
         .all()
     )
-    staff_ids = {value for value in (row.staff_id, row.submitted_by_staff_id, row.verified_by_staff_id) if value}
-    staff_ids.update(audit.staff_id for audit in audits if audit.staff_id)
-    staff_name_by_id = resolve_staff_names(db, staff_ids)
+    # Audit author names arrive embedded; only the closing-level staff ids
+    # still need a separate lookup.
+    staff_name_by_id: dict = {}
+    for audit in audits:
+        profile = getattr(audit, "user_profiles", None)
+        if profile:
+            staff_name_by_id[profile["id"]] = profile["username"]
+    remaining_ids = {
+        value
+        for value in (row.staff_id, row.submitted_by_staff_id, row.verified_by_staff_id)
+        if value and value not in staff_name_by_id
+    }
+    staff_name_by_id.update(resolve_staff_names(db, remaining_ids))
 
     created_by_staff_id = row.staff_id
     for audit in reversed(audits):
@@ -1953,7 +2017,7 @@ def staff_cash_closing_auto_sales(
     _ = ensure_staff(request, db)
     if not business_date:
         raise HTTPException(status_code=422, detail="business_date is required")
-    sales = summarize_order_sales_for_date(db, business_date)
+    sales = summarize_order_sales_and_discount_for_date(db, business_date)
     return JSONResponse(sales)
 
 
@@ -2014,6 +2078,7 @@ def staff_schedule_update(
         "1" if is_enabled else "0",
         staff.staff_id,
     )
+    invalidate_schedule_flag_cache()
     return RedirectResponse(url="/staff/schedule", status_code=status.HTTP_303_SEE_OTHER)
 
 
@@ -2138,14 +2203,20 @@ def admin_sales_rental_create_or_upsert(
 
     row = db.query("rental_daily_sales").filter(("business_date", "=", business_date)).first()
     if row is None:
-        db.insert("rental_daily_sales", {
-            "business_date": business_date,
-            "revenue_amount": revenue_amount,
-            "customer_count": customer_count,
-            "note": note.strip() or None,
-            "staff_id": staff.staff_id,
-            "created_at": utc_now(),
-        })
+        try:
+            db.insert("rental_daily_sales", {
+                "business_date": business_date,
+                "revenue_amount": revenue_amount,
+                "customer_count": customer_count,
+                "note": note.strip() or None,
+                "staff_id": staff.staff_id,
+                "created_at": utc_now(),
+            })
+        except APIError as exc:
+            # A racing create won the unique index on business_date
+            if exc.code == "23505":
+                raise HTTPException(status_code=400, detail="Same date row already exists.") from exc
+            raise
     else:
         row.revenue_amount = revenue_amount
         row.customer_count = customer_count
@@ -2184,20 +2255,18 @@ def admin_sales_rental_update(
     if customer_count < 0:
         raise HTTPException(status_code=400, detail="Customer count must be non-negative.")
 
-    duplicated = (
-        db.query("rental_daily_sales")
-        .filter(("business_date", "=", business_date), ("rental_id", "!=", rental_id))
-        .first()
-    )
-    if duplicated:
-        raise HTTPException(status_code=400, detail="Same date row already exists.")
-
     row.business_date = business_date
     row.revenue_amount = revenue_amount
     row.customer_count = customer_count
     row.note = note.strip() or None
     row.staff_id = staff.staff_id
-    db.update(row)
+    try:
+        db.update(row)
+    except APIError as exc:
+        # Unique index on business_date replaces the old duplicate pre-check query
+        if exc.code == "23505":
+            raise HTTPException(status_code=400, detail="Same date row already exists.") from exc
+        raise
 
     redirect_start = start_date.strip() or business_date
     redirect_end = end_date.strip() or business_date
@@ -2317,6 +2386,7 @@ def admin_completion_message_update(
             resolved["secondary"][lang_code],
             staff.staff_id,
         )
+    invalidate_completion_messages_cache()
     return RedirectResponse(url="/staff/admin/completion-message", status_code=status.HTTP_303_SEE_OTHER)
 
 
@@ -2722,7 +2792,7 @@ def staff_orders_api(
     show_all_picked_up: bool = False,
     q: str = "",
     db: SupabaseDB = Depends(get_db),
-) -> JSONResponse:
+) -> ORJSONResponse:
     _ = ensure_staff(request, db)
     selected_status_filters = normalize_status_filters(status_filter)
     orders = query_staff_orders(
@@ -2734,7 +2804,8 @@ def staff_orders_api(
     )
     root_ids = [o.order_id for o in orders if not getattr(o, "parent_order_id", None)]
     unpaid_ext = get_unpaid_ext_parent_ids(db, root_ids) if root_ids else set()
-    return JSONResponse({"orders": [serialize_staff_order(order, unpaid_ext) for order in orders]})
+    # orjson serializes the 500-row payload far faster than stdlib json
+    return ORJSONResponse({"orders": [serialize_staff_order(order, unpaid_ext) for order in orders]})
 
 
 @app.post("/staff/api/orders/{order_id}/inline-update")
@@ -2743,11 +2814,9 @@ def staff_inline_update_order(
     order_id: str,
     payload: dict = Body(...),
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> JSONResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     name = str(payload.get("name", "")).strip()
     phone = str(payload.get("phone", "")).strip()
@@ -2831,11 +2900,9 @@ def staff_toggle_warehouse(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> JSONResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
     order.in_warehouse = not bool(getattr(order, "in_warehouse", False))
     order.staff_id = staff.staff_id
     db.update(order)
@@ -2847,11 +2914,9 @@ def staff_cancel_order(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> JSONResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
     if order.status == "PICKED_UP":
         raise HTTPException(status_code=400, detail="수령완료 건은 취소할 수 없습니다.")
     order.status = "CANCELLED"
@@ -2910,11 +2975,9 @@ def staff_inline_pickup_order(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> JSONResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     if order.status != "PICKED_UP":
         try:
@@ -2931,11 +2994,9 @@ def staff_inline_undo_pickup_order(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> JSONResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     if order.status == "PICKED_UP":
         undo_pickup_completion(order, staff.staff_id)
@@ -2951,10 +3012,17 @@ def staff_order_detail(
     db: SupabaseDB = Depends(get_db),
 ) -> HTMLResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
+    # Embed the last-modifying staff profile so the page needs one fetch, not two
+    order = db.get_with_embed(
+        "orders", "order_id", order_id,
+        embed="staff:user_profiles!staff_id(id,username,display_name)",
+    )
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-    last_modified_staff = db.get("user_profiles", "id", order.staff_id) if order.staff_id else None
+    staff_profile = getattr(order, "staff", None)
+    last_modified_staff = (
+        Row("user_profiles", "user_profiles", "id", staff_profile) if staff_profile else None
+    )
 
     # Fetch extension orders (children) if this is a root order
     parent_id = getattr(order, "parent_order_id", None) or ""
@@ -2995,11 +3063,9 @@ def staff_create_extension(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> RedirectResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
     if order.status not in {"PAID", "PAYMENT_PENDING"}:
         raise HTTPException(status_code=400, detail="결제대기/결제완료 상태만 연장할 수 있습니다.")
 
@@ -3021,11 +3087,9 @@ def staff_mark_paid(
     payment_method: str = Form(...),
     tag_no: str = Form(""),
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> RedirectResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     if order.status not in {"PAYMENT_PENDING", "PAID"}:
         raise HTTPException(status_code=400, detail="Only pending orders can be paid.")
@@ -3056,11 +3120,9 @@ def staff_update_order(
     expected_pickup_at: str = Form(...),
     status_value: str = Form(""),
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> RedirectResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     normalized_status = status_value.strip().upper()
     if normalized_status and normalized_status not in {"PAYMENT_PENDING", "PAID", "PICKED_UP"}:
@@ -3107,11 +3169,9 @@ def staff_mark_picked_up(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> RedirectResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
     try:
         apply_pickup_completion(order, staff.staff_id)
     except ValueError as exc:
@@ -3126,11 +3186,9 @@ def staff_undo_picked_up(
     request: Request,
     order_id: str,
     db: SupabaseDB = Depends(get_db),
+    order: Row = Depends(get_order_or_404),
 ) -> RedirectResponse:
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
 
     if order.status == "PICKED_UP":
         undo_pickup_completion(order, staff.staff_id)
@@ -3198,21 +3256,75 @@ def create_manual_order(
     return RedirectResponse(url=f"/staff/orders/{order_id}", status_code=status.HTTP_303_SEE_OTHER)
 
 
-def _serve_storage_image(storage_path: str) -> Response:
-    """Download an image from Cloudflare R2 and return as an HTTP response."""
-    data = r2_download(storage_path)
-    ext = Path(storage_path).suffix.lower()
-    content_type = {
-        ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-        ".webp": "image/webp", ".heic": "image/heic", ".heif": "image/heif",
-    }.get(ext, "image/jpeg")
-    return Response(
-        content=data,
+_IMAGE_CONTENT_TYPES = {
+    "png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg",
+    "webp": "image/webp", "heic": "image/heic", "heif": "image/heif",
+}
+
+
+def _serve_storage_image(storage_path: str, background: Optional[BackgroundTask] = None) -> Response:
+    """Stream an image from Cloudflare R2 without buffering it in memory."""
+    ext = storage_path.rpartition(".")[2].lower()
+    content_type = _IMAGE_CONTENT_TYPES.get(ext, "image/jpeg")
+    return StreamingResponse(
+        r2_stream(storage_path),
         media_type=content_type,
         headers={"Cache-Control": "no-store", "Content-Disposition": "inline"},
+        background=background,
     )
 
 
+# Image-view audit logs are write-only bookkeeping, so they are buffered per
+# process and flushed in one bulk insert after the response is sent instead of
+# costing every image request a synchronous DB round trip.
+_AUDIT_FLUSH_MAX_ROWS = 50
+_AUDIT_FLUSH_MAX_AGE_SECONDS = 0.25
+_audit_log_buffer: list[dict] = []
+_audit_log_buffer_lock = threading.Lock()
+_audit_log_oldest_at = 0.0
+
+
+def _queue_audit_log(entry: dict) -> None:
+    global _audit_log_oldest_at
+    with _audit_log_buffer_lock:
+        if not _audit_log_buffer:
+            _audit_log_oldest_at = time.monotonic()
+        _audit_log_buffer.append(entry)
+
+
+def _flush_audit_logs(db: SupabaseDB, force: bool = False) -> None:
+    with _audit_log_buffer_lock:
+        if not _audit_log_buffer:
+            return
+        buffer_age = time.monotonic() - _audit_log_oldest_at
+        if (
+            not force
+            and len(_audit_log_buffer) < _AUDIT_FLUSH_MAX_ROWS
+            and buffer_age < _AUDIT_FLUSH_MAX_AGE_SECONDS
+        ):
+            return
+        rows = _audit_log_buffer[:]
+        _audit_log_buffer.clear()
+    try:
+        db.insert_many("audit_logs", rows)
+    except Exception:
+        # Re-queue so a transient DB error doesn't drop audit entries
+        with _audit_log_buffer_lock:
+            _audit_log_buffer[:0] = rows
+        logger.exception("audit log flush failed (%d rows re-queued)", len(rows))
+
+
+def _audit_log_flusher() -> None:
+    """Daemon loop that drains audit entries left behind by quiet periods."""
+    db = SupabaseDB(url=SUPABASE_URL, service_role_key=SUPABASE_SERVICE_ROLE_KEY)
+    while True:
+        time.sleep(_AUDIT_FLUSH_MAX_AGE_SECONDS)
+        try:
+            _flush_audit_logs(db, force=True)
+        except Exception:
+            logger.exception("Audit log flusher iteration failed")
+
+
 def _serve_order_image(
     request: Request,
     order_id: str,
@@ -3222,12 +3334,12 @@ def _serve_order_image(
 ) -> Response:
     """Shared helper for serving order images (ID or luggage) with audit logging."""
     staff = ensure_staff(request, db)
-    order = db.get("orders", "order_id", order_id)
+    order = db.get("orders", "order_id", order_id, select=f"order_id,{image_field}")
     image_url = getattr(order, image_field, None) if order else None
     if order is None or not image_url:
         raise HTTPException(status_code=404, detail="Image not found")
 
-    db.insert("audit_logs", {
+    _queue_audit_log({
         "order_id": order.order_id,
         "staff_id": staff.staff_id,
         "device_id": request.headers.get("x-device-id", request.client.host if request.client else "unknown"),
@@ -3235,7 +3347,7 @@ def _serve_order_image(
         "timestamp": utc_now(),
     })
 
-    return _serve_storage_image(image_url)
+    return _serve_storage_image(image_url, background=BackgroundTask(_flush_audit_logs, db))
 
 
 @app.get("/staff/orders/{order_id}/id-image")
@@ -1,29 +1,131 @@
+import asyncio
+
+import diskcache
 import httpx
 
-from app.config import R2_ACCOUNT_ID, R2_API_TOKEN, R2_BUCKET_NAME
+from app.config import R2_ACCOUNT_ID, R2_API_TOKEN, R2_BUCKET_NAME, R2_CACHE_DIR
 
 _BASE = "https://api.cloudflare.com/client/v4/accounts/{account}/r2/buckets/{bucket}/objects/{key}"
 
+# Shared keep-alive client: amortizes TCP+TLS setup across R2 calls instead of
+# opening a fresh connection per upload/download/delete.
+_CLIENT = httpx.Client(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+    headers={"Authorization": f"Bearer {R2_API_TOKEN}"},
+)
+
 
 def _url(key: str) -> str:
     return _BASE.format(account=R2_ACCOUNT_ID, bucket=R2_BUCKET_NAME, key=key)
 
 
 def r2_upload(path: str, data: bytes, content_type: str) -> None:
-    headers = {"Authorization": f"Bearer {R2_API_TOKEN}", "Content-Type": content_type}
-    resp = httpx.put(_url(path), headers=headers, content=data, timeout=30)
+    resp = _CLIENT.put(_url(path), headers={"Content-Type": content_type}, content=data)
     resp.raise_for_status()
 
 
+# Object bodies are immutable per storage path, so repeat staff views can be
+# served from local disk instead of re-downloading from R2. The LRU evicts by
+# size; the expire is a backstop matching the image retention window.
+_IMAGE_CACHE = diskcache.Cache(str(R2_CACHE_DIR), size_limit=2 * 1024**3)
+_CACHE_EXPIRE_SECONDS = 7 * 86400
+
+
 def r2_download(path: str) -> bytes:
-    headers = {"Authorization": f"Bearer {R2_API_TOKEN}"}
-    resp = httpx.get(_url(path), headers=headers, timeout=30)
+    cached = _IMAGE_CACHE.get(path)
+    if cached is not None:
+        return cached
+    resp = _CLIENT.get(_url(path))
     resp.raise_for_status()
+    _IMAGE_CACHE.set(path, resp.content, expire=_CACHE_EXPIRE_SECONDS)
     return resp.content
 
 
+def _iter_cached(reader, chunk_size: int):
+    if isinstance(reader, bytes):
+        yield reader
+        return
+    with reader:
+        while chunk := reader.read(chunk_size):
+            yield chunk
+
+
+def _iter_remote(resp: httpx.Response, path: str, chunk_size: int):
+    # Tees the body into the cache, which buffers one full copy in memory on
+    # this cold path; bounded in practice by the order-image upload size.
+    # The cache set is skipped if the consumer stops early (partial body).
+    chunks: list[bytes] = []
+    try:
+        for chunk in resp.iter_bytes(chunk_size):
+            chunks.append(chunk)
+            yield chunk
+        _IMAGE_CACHE.set(path, b"".join(chunks), expire=_CACHE_EXPIRE_SECONDS)
+    finally:
+        resp.close()
+
+
+def r2_stream(path: str, chunk_size: int = 64 * 1024):
+    """Return an iterator of object bytes in chunks.
+
+    R2 errors are raised here, before any bytes are produced, so callers can
+    still fail with a clean status instead of dying mid-StreamingResponse.
+    """
+    # Warm path: diskcache hands back a file handle for large values
+    reader = _IMAGE_CACHE.get(path, read=True)
+    if reader is not None:
+        return _iter_cached(reader, chunk_size)
+
+    # Cold path: open the stream and check the status now — once the caller
+    # has started a 200 response it is too late to surface an error
+    request = _CLIENT.build_request("GET", _url(path))
+    resp = _CLIENT.send(request, stream=True)
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError:
+        resp.close()
+        raise
+    return _iter_remote(resp, path, chunk_size)
+
+
+# Cap concurrent deletes so bulk cleanups don't exhaust sockets or rate limits
+_DELETE_CONCURRENCY = 16
+
+
+async def r2_delete_async(paths: list[str]) -> None:
+    """Delete many objects concurrently instead of one blocking call per path."""
+    pending = [path for path in paths if path]
+    if not pending:
+        return
+
+    sem = asyncio.Semaphore(_DELETE_CONCURRENCY)
+
+    async def _delete_one(client: httpx.AsyncClient, path: str) -> None:
+        async with sem:
+            await client.delete(_url(path), timeout=10)
+
+    async with httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(
+            max_keepalive_connections=_DELETE_CONCURRENCY,
+            max_connections=_DELETE_CONCURRENCY * 2,
+        ),
+        headers={"Authorization": f"Bearer {R2_API_TOKEN}"},
+    ) as client:
+        await asyncio.gather(
+            *(_delete_one(client, path) for path in pending),
+            return_exceptions=True,
+        )
+    for path in pending:
+        _IMAGE_CACHE.delete(path)
+
+
 def r2_delete(paths: list[str]) -> None:
-    headers = {"Authorization": f"Bearer {R2_API_TOKEN}"}
-    for path in paths:
-        if path:
-            httpx.delete(_url(path), headers=headers, timeout=10)
+    pending = [path for path in paths if path]
+    if not pending:
+        return
+    if len(pending) == 1:
+        _CLIENT.delete(_url(pending[0]), timeout=10)
+        _IMAGE_CACHE.delete(pending[0])
+        return
+    asyncio.run(r2_delete_async(pending))
@@ -30,21 +30,29 @@ def parse_cash_closing_type(raw_value: str) -> str:
     return value
 
 
-def ensure_unique_cash_closing_type(
+def fetch_cash_closing_snapshot(
     db: SupabaseDB,
     business_date: str,
     closing_type: str,
+) -> dict:
+    """One RPC round trip: the day's cash/QR order sales plus any existing
+    closing_id for (business_date, closing_type)."""
+    result = db.client.rpc("cash_closing_snapshot", {
+        "p_business_date": business_date,
+        "p_closing_type": closing_type,
+    }).execute()
+    return result.data or {}
+
+
+def ensure_no_duplicate_cash_closing(
+    snapshot: dict,
+    business_date: str,
+    closing_type: str,
     *,
     exclude_closing_id: Optional[int] = None,
 ) -> None:
-    q = db.query("cash_closings").filter(
-        ("business_date", "=", business_date),
-        ("closing_type", "=", closing_type),
-    )
-    if exclude_closing_id:
-        q = q.filter(("closing_id", "!=", exclude_closing_id))
-    exists = q.first()
-    if exists:
+    existing_closing_id = snapshot.get("existing_closing_id")
+    if existing_closing_id and existing_closing_id != exclude_closing_id:
         raise HTTPException(
             status_code=400,
             detail=f"해당 날짜({business_date})의 {closing_type} 정산이 이미 존재합니다.",
@@ -70,8 +78,8 @@ def create_cash_closing_audit(
     })
 
 
-def calc_cash_total(counts_by_denom: dict[int, int]) -> int:
-    return sum(denom * counts_by_denom.get(denom, 0) for denom in COIN_BILL_DENOMS)
+def calc_cash_total(counts: tuple[int, ...]) -> int:
+    return sum(denom * count for denom, count in zip(COIN_BILL_DENOMS, counts))
 
 
 def parse_denomination_counts(
@@ -85,20 +93,21 @@ def parse_denomination_counts(
     count_10: int,
     count_5: int,
     count_1: int,
-) -> dict[int, int]:
-    counts = {
-        10000: count_10000,
-        5000: count_5000,
-        2000: count_2000,
-        1000: count_1000,
-        500: count_500,
-        100: count_100,
-        50: count_50,
-        10: count_10,
-        5: count_5,
-        1: count_1,
-    }
-    if any(value < 0 for value in counts.values()):
+) -> tuple[int, ...]:
+    # Dense tuple in COIN_BILL_DENOMS order; calc_cash_total zips against it
+    counts = (
+        count_10000,
+        count_5000,
+        count_2000,
+        count_1000,
+        count_500,
+        count_100,
+        count_50,
+        count_10,
+        count_5,
+        count_1,
+    )
+    if any(value < 0 for value in counts):
         raise HTTPException(status_code=400, detail="Bill/Coin counts must be non-negative.")
     return counts
 
@@ -114,29 +123,26 @@ def parse_actual_qr_amount(raw_value: int, auto_qr_amount: int) -> int:
 # ---------------------------------------------------------------------------
 
 def build_cash_closing_fields(
-    counts: dict[int, int],
+    counts: tuple[int, ...],
     actual_qr_amount: int,
-    db: SupabaseDB,
-    business_date: str,
+    snapshot: dict,
 ) -> dict[str, object]:
     """Compute the shared denomination-total and difference fields.
 
     Used by both ``staff_cash_closing_create`` and ``staff_cash_closing_update``
-    to avoid duplicating the computation logic.
+    to avoid duplicating the computation logic. ``snapshot`` comes from
+    ``fetch_cash_closing_snapshot`` so the sales aggregation happens DB-side.
 
     Returns a dict with keys that can be applied directly to a cash_closings
     insert payload or row update.
     """
-    from app.services.sales import summarize_order_sales_for_date
-
     total_amount = calc_cash_total(counts)
-    sales = summarize_order_sales_for_date(db, business_date)
-    auto_paypay = sales["qr_amount"]
+    auto_paypay = int(snapshot.get("qr_amount") or 0)
     resolved_actual_qr = parse_actual_qr_amount(actual_qr_amount, auto_paypay)
     if resolved_actual_qr < 0:
         raise HTTPException(status_code=400, detail="QR actual amount must be non-negative.")
     qr_difference_amount = resolved_actual_qr - auto_paypay
-    check_auto_amount = sales["cash_amount"]
+    check_auto_amount = int(snapshot.get("cash_amount") or 0)
     difference_amount = total_amount - check_auto_amount
 
     return {
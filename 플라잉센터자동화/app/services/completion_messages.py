@@ -1,11 +1,13 @@
 """Completion message subsystem: constants, normalization, translation, and loading."""
 from __future__ import annotations
 
-import json
+import asyncio
 import re
+import time
+from functools import lru_cache
 from typing import Optional
-from urllib.parse import urlencode
-from urllib.request import Request as URLRequest, urlopen
+
+import httpx
 
 from app.supabase_client import SupabaseDB
 
@@ -59,8 +61,6 @@ DEFAULT_SUCCESS_SECONDARY_MESSAGES = {
     ),
 }
 
-HANGUL_RE = re.compile(r"[가-힣]")
-
 COMPLETION_LINE_TRANSLATIONS = {
     "짐보관신청서 작성이 완료 되었습니다.": {
         "en": "Your luggage storage form has been completed.",
@@ -88,77 +88,91 @@ COMPLETION_LINE_TRANSLATIONS = {
     },
 }
 
+# (regex fragment, canonical line). Fragments use non-capturing groups so the
+# union regex below can dispatch on its named alternatives.
 COMPLETION_LINE_PATTERNS = (
-    (re.compile(r"작성.*완료"), "짐보관신청서 작성이 완료 되었습니다."),
+    (r"작성.*완료", "짐보관신청서 작성이 완료 되었습니다."),
     (
-        re.compile(r"\{amount\}.*(금액|결제|준비).*(불러|호명|호출|이름)"),
+        r"\{amount\}.*(?:금액|결제|준비).*(?:불러|호명|호출|이름)",
         "{amount} 금액 준비 해주시면, 순차적으로 성함 불러드리겠습니다.",
     ),
-    (re.compile(r"플라잉재팬.*혜택"), "플라잉재팬만의 혜택"),
+    (r"플라잉재팬.*혜택", "플라잉재팬만의 혜택"),
     (
-        re.compile(r"화이트패스.*증정"),
+        r"화이트패스.*증정",
         "오사카 맛집 제휴할인되는 플라잉 화이트패스 증정!",
     ),
     (
-        re.compile(r"(에디온|edion).*(17%|17 %|최대)", flags=re.IGNORECASE),
+        r"(?:에디온|edion).*(?:17%|17 %|최대)",
         "이건물 드럭스토어 에디온에서 플라잉패스 제시만 해도 최대 17% 할인되고,",
     ),
     (
-        re.compile(r"(qr|QR).*혜택", flags=re.IGNORECASE),
+        r"(?:qr).*혜택",
         "뒷면 QR코드로 오사카 제휴 맛집 리스트와 혜택도 확인 가능합니다!",
     ),
 )
 
+# Single alternation scan per line instead of up to 6 separate pattern.search
+# calls; match.lastgroup tells which alternative hit.
+_COMPLETION_LINE_UNION = re.compile(
+    "|".join(
+        f"(?P<g{i}>{pattern})"
+        for i, (pattern, _) in enumerate(COMPLETION_LINE_PATTERNS)
+    ),
+    flags=re.IGNORECASE,
+)
+_GROUP_TO_CANONICAL = tuple(canonical for _, canonical in COMPLETION_LINE_PATTERNS)
+
 
 # ---------------------------------------------------------------------------
 # Functions
 # ---------------------------------------------------------------------------
 
+# \r\n becomes \n\n under the translate table, which is harmless because the
+# blank lines are dropped below; one table pass replaces two full replaces.
+_CR_TO_LF = str.maketrans("\r", "\n")
+# The three accepted spellings of the amount token, folded in one regex pass
+_AMOUNT_TOKEN_RE = re.compile(r"ㅇㅇㅇㅇ|\{ amount \}|\{\{amount\}\}")
+
+
 def normalize_completion_message_text(text: str) -> str:
-    normalized = (text or "").replace("\r\n", "\n").replace("\r", "\n")
-    normalized = normalized.replace("ㅇㅇㅇㅇ", "{amount}")
-    normalized = normalized.replace("{ amount }", "{amount}")
-    normalized = normalized.replace("{{amount}}", "{amount}")
+    normalized = (text or "").translate(_CR_TO_LF)
+    normalized = _AMOUNT_TOKEN_RE.sub("{amount}", normalized)
     normalized = normalized.replace("{amount}금액", "{amount} 금액")
     lines = [line.strip() for line in normalized.split("\n") if line.strip()]
     return "\n".join(lines)
 
 
 def contains_hangul(text: str) -> bool:
-    return bool(HANGUL_RE.search(text or ""))
+    # Direct code-point range check ("가".."힣"); skips the regex engine on a
+    # path that runs for every line of every translation pass
+    return any("가" <= char <= "힣" for char in (text or ""))
 
 
+@lru_cache(maxsize=256)
 def canonical_completion_line(source_line: str) -> Optional[str]:
     if source_line in COMPLETION_LINE_TRANSLATIONS:
         return source_line
-    for pattern, canonical_line in COMPLETION_LINE_PATTERNS:
-        if pattern.search(source_line):
-            return canonical_line
+    match = _COMPLETION_LINE_UNION.search(source_line)
+    if match and match.lastgroup:
+        return _GROUP_TO_CANONICAL[int(match.lastgroup[1:])]
     return None
 
 
-def translate_completion_line_via_api(source_line: str, lang: str) -> str:
-    if lang not in ("en", "ja") or not source_line.strip():
-        return ""
+_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+_PLACEHOLDER_TOKEN = "ZXQAMOUNTTOKENQXZ"
 
-    placeholder_token = "ZXQAMOUNTTOKENQXZ"
-    query_text = source_line.replace("{amount}", placeholder_token)
-    translate_url = "https://translate.googleapis.com/translate_a/single?" + urlencode(
-        {
-            "client": "gtx",
-            "sl": "ko",
-            "tl": lang,
-            "dt": "t",
-            "q": query_text,
-        }
-    )
-    try:
-        request = URLRequest(translate_url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(request, timeout=3) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-    except Exception:
-        return ""
 
+def _translate_params(query_text: str, lang: str) -> dict[str, str]:
+    return {
+        "client": "gtx",
+        "sl": "ko",
+        "tl": lang,
+        "dt": "t",
+        "q": query_text,
+    }
+
+
+def _parse_translate_payload(payload: object, source_line: str) -> str:
     if not isinstance(payload, list) or not payload:
         return ""
     segments = payload[0]
@@ -170,30 +184,88 @@ def translate_completion_line_via_api(source_line: str, lang: str) -> str:
     if not translated_text:
         return ""
 
-    translated_text = re.sub(placeholder_token, "{amount}", translated_text, flags=re.IGNORECASE)
+    translated_text = re.sub(_PLACEHOLDER_TOKEN, "{amount}", translated_text, flags=re.IGNORECASE)
     if "{amount}" in source_line and "{amount}" not in translated_text:
         return ""
     return translated_text
 
 
-def auto_translate_completion_text(ko_text: str, lang: str) -> str:
-    if lang == "ko":
-        return ko_text
-
-    translated_lines: list[str] = []
-    for source_line in [line.strip() for line in ko_text.split("\n") if line.strip()]:
-        translated_line = ""
-        canonical_line = canonical_completion_line(source_line)
-        if canonical_line:
-            translated_line = COMPLETION_LINE_TRANSLATIONS.get(canonical_line, {}).get(lang, "")
-
-        if (not translated_line or contains_hangul(translated_line)) and contains_hangul(source_line):
-            translated_from_api = translate_completion_line_via_api(source_line, lang)
-            if translated_from_api:
-                translated_line = translated_from_api
-
-        translated_lines.append(translated_line if translated_line else source_line)
-    return "\n".join(translated_lines)
+async def _translate_line_via_api_async(
+    client: httpx.AsyncClient,
+    source_line: str,
+    lang: str,
+) -> str:
+    query_text = source_line.replace("{amount}", _PLACEHOLDER_TOKEN)
+    try:
+        response = await client.get(
+            _TRANSLATE_URL,
+            params=_translate_params(query_text, lang),
+        )
+        response.raise_for_status()
+        payload = response.json()
+    except Exception:
+        return ""
+    return _parse_translate_payload(payload, source_line)
+
+
+def _split_message_lines(text: str) -> list[str]:
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+def _needs_api_translation(source_line: str, translated_line: str) -> bool:
+    return (not translated_line or contains_hangul(translated_line)) and contains_hangul(source_line)
+
+
+# Successful API translations keyed by (source_line, lang): admins re-preview
+# the same lines often, and each hit saves an outbound HTTP call.
+_TRANSLATED_LINE_CACHE_MAX = 512
+_translated_line_cache: dict[tuple[str, str], str] = {}
+
+
+async def _translate_lines_async(
+    client: httpx.AsyncClient,
+    source_lines: list[str],
+    canonical_lines: list[Optional[str]],
+    lang: str,
+) -> str:
+    """Translate pre-split lines; unknown ones fall back to the API concurrently.
+
+    ``canonical_lines`` is computed once by the caller and shared between the
+    en and ja passes so each line is canonical-matched a single time.
+    """
+    translated_lines = [
+        COMPLETION_LINE_TRANSLATIONS.get(canonical_line, {}).get(lang, "") if canonical_line else ""
+        for canonical_line in canonical_lines
+    ]
+
+    pending: list[int] = []
+    for index, source_line in enumerate(source_lines):
+        if not _needs_api_translation(source_line, translated_lines[index]):
+            continue
+        cached = _translated_line_cache.get((source_line, lang))
+        if cached:
+            translated_lines[index] = cached
+        else:
+            pending.append(index)
+    if pending:
+        results = await asyncio.gather(
+            *(
+                _translate_line_via_api_async(client, source_lines[index], lang)
+                for index in pending
+            ),
+            return_exceptions=True,
+        )
+        for index, result in zip(pending, results):
+            if isinstance(result, str) and result:
+                translated_lines[index] = result
+                if len(_translated_line_cache) >= _TRANSLATED_LINE_CACHE_MAX:
+                    _translated_line_cache.clear()
+                _translated_line_cache[(source_lines[index], lang)] = result
+
+    return "\n".join(
+        translated_line if translated_line else source_line
+        for translated_line, source_line in zip(translated_lines, source_lines)
+    )
 
 
 def build_completion_messages_from_ko(
@@ -207,30 +279,80 @@ def build_completion_messages_from_ko(
     if not normalized_secondary:
         normalized_secondary = DEFAULT_SUCCESS_SECONDARY_MESSAGES["ko"]
 
+    # Split and canonical-match each message once; both language passes share it
+    primary_lines = _split_message_lines(normalized_primary)
+    secondary_lines = _split_message_lines(normalized_secondary)
+    primary_canonical = [canonical_completion_line(line) for line in primary_lines]
+    secondary_canonical = [canonical_completion_line(line) for line in secondary_lines]
+
+    async def _gather() -> list[str]:
+        # All en/ja lines for both messages go out in one concurrent burst
+        async with httpx.AsyncClient(
+            timeout=3,
+            headers={"User-Agent": "Mozilla/5.0"},
+        ) as client:
+            return await asyncio.gather(
+                _translate_lines_async(client, primary_lines, primary_canonical, "en"),
+                _translate_lines_async(client, primary_lines, primary_canonical, "ja"),
+                _translate_lines_async(client, secondary_lines, secondary_canonical, "en"),
+                _translate_lines_async(client, secondary_lines, secondary_canonical, "ja"),
+            )
+
+    primary_en, primary_ja, secondary_en, secondary_ja = asyncio.run(_gather())
     return {
         "primary": {
             "ko": normalized_primary,
-            "en": auto_translate_completion_text(normalized_primary, "en"),
-            "ja": auto_translate_completion_text(normalized_primary, "ja"),
+            "en": primary_en,
+            "ja": primary_ja,
         },
         "secondary": {
             "ko": normalized_secondary,
-            "en": auto_translate_completion_text(normalized_secondary, "en"),
-            "ja": auto_translate_completion_text(normalized_secondary, "ja"),
+            "en": secondary_en,
+            "ja": secondary_ja,
         },
     }
 
 
+# Settings change rarely but every customer success page loads them; cache the
+# resolved messages briefly and let the admin update endpoint invalidate early.
+_CACHE_TTL_SECONDS = 60.0
+_cached_messages: Optional[dict[str, dict[str, str]]] = None
+_cache_expires_at: float = 0.0
+
+
+def invalidate_completion_messages_cache() -> None:
+    global _cached_messages, _cache_expires_at
+    _cached_messages = None
+    _cache_expires_at = 0.0
+
+
 def load_completion_messages(db: SupabaseDB) -> dict[str, dict[str, str]]:
-    from app.services.settings import get_app_setting
+    global _cached_messages, _cache_expires_at
+    now = time.monotonic()
+    if _cached_messages is not None and now < _cache_expires_at:
+        return _cached_messages
+
+    messages = _load_completion_messages_uncached(db)
+    _cached_messages = messages
+    _cache_expires_at = now + _CACHE_TTL_SECONDS
+    return messages
+
+
+def _load_completion_messages_uncached(db: SupabaseDB) -> dict[str, dict[str, str]]:
+    from app.services.settings import get_app_settings_bulk
+
+    # All 8 keys live in app_settings — fetch them in one round trip
+    setting_keys = [
+        *SUCCESS_PRIMARY_MESSAGE_KEYS.values(),
+        *SUCCESS_SECONDARY_MESSAGE_KEYS.values(),
+    ]
+    stored = get_app_settings_bulk(db, setting_keys)
 
-    ko_primary = get_app_setting(
-        db,
+    ko_primary = stored.get(
         SUCCESS_PRIMARY_MESSAGE_KEYS["ko"],
         DEFAULT_SUCCESS_PRIMARY_MESSAGES["ko"],
     )
-    ko_secondary = get_app_setting(
-        db,
+    ko_secondary = stored.get(
         SUCCESS_SECONDARY_MESSAGE_KEYS["ko"],
         DEFAULT_SUCCESS_SECONDARY_MESSAGES["ko"],
     )
@@ -239,13 +361,11 @@ def load_completion_messages(db: SupabaseDB) -> dict[str, dict[str, str]]:
     resolved_primary: dict[str, str] = {}
     resolved_secondary: dict[str, str] = {}
     for lang_code in ("ko", "en", "ja"):
-        resolved_primary[lang_code] = get_app_setting(
-            db,
+        resolved_primary[lang_code] = stored.get(
             SUCCESS_PRIMARY_MESSAGE_KEYS[lang_code],
             auto_messages["primary"][lang_code],
         )
-        resolved_secondary[lang_code] = get_app_setting(
-            db,
+        resolved_secondary[lang_code] = stored.get(
             SUCCESS_SECONDARY_MESSAGE_KEYS[lang_code],
             auto_messages["secondary"][lang_code],
         )
@@ -1,12 +1,14 @@
 """Flying Pass tier logic: normalization, discounts, and order recalculation."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
 from app.services.pricing import calculate_prepaid_amount
 
 
 FLYING_PASS_TIERS = ("NONE", "BLUE", "SILVER", "GOLD", "PLATINUM", "BLACK")
+FLYING_PASS_TIERS_SET = frozenset(FLYING_PASS_TIERS)
 FLYING_PASS_FIXED_DISCOUNTS = {
     "NONE": 0,
     "BLUE": 100,
@@ -39,20 +41,31 @@ def build_flying_pass_tiers_json() -> list[dict[str, object]]:
     ]
 
 
-def normalize_flying_pass_tier(raw_value: object, default: str = "NONE") -> str:
-    value = str(raw_value or "").strip().upper()
-    if value in FLYING_PASS_TIERS:
+@lru_cache(maxsize=256)
+def _normalize_flying_pass_tier_cached(raw_value: str, default: str) -> str:
+    value = raw_value.strip().upper()
+    if value in FLYING_PASS_TIERS_SET:
         return value
     return default
 
 
+def normalize_flying_pass_tier(raw_value: object, default: str = "NONE") -> str:
+    # Fast path: the DB stores canonical upper-case tiers, so bulk loops over
+    # order rows usually skip the str()/strip()/upper() round entirely. The
+    # isinstance guard keeps unhashable values (free-form JSON bodies reach
+    # here) on the coercing slow path instead of blowing up the membership test
+    if isinstance(raw_value, str) and raw_value in FLYING_PASS_TIERS_SET:
+        return raw_value
+    return _normalize_flying_pass_tier_cached(str(raw_value or ""), default)
+
+
 def flying_pass_discount_amount(base_prepaid: int, tier: str) -> int:
     resolved_base = max(int(base_prepaid or 0), 0)
     normalized_tier = normalize_flying_pass_tier(tier)
     if normalized_tier == "BLACK":
         return resolved_base
-    fixed_discount = int(FLYING_PASS_FIXED_DISCOUNTS.get(normalized_tier, 0))
-    return min(resolved_base, max(fixed_discount, 0))
+    # FLYING_PASS_FIXED_DISCOUNTS values are non-negative module constants
+    return min(resolved_base, FLYING_PASS_FIXED_DISCOUNTS.get(normalized_tier, 0))
 
 
 def recalculate_order_prepaid(
@@ -62,9 +75,10 @@ def recalculate_order_prepaid(
     flying_pass_tier: Optional[str] = None,
     submitted_prepaid_amount: Optional[int] = None,
 ) -> dict[str, object]:
-    resolved_days = int(expected_storage_days if expected_storage_days is not None else order.expected_storage_days or 1)
-    if resolved_days < 1:
-        resolved_days = 1
+    resolved_days = max(
+        int(expected_storage_days if expected_storage_days is not None else order.expected_storage_days or 1),
+        1,
+    )
 
     resolved_tier = normalize_flying_pass_tier(
         flying_pass_tier if flying_pass_tier is not None else order.flying_pass_tier
@@ -73,16 +87,14 @@ def recalculate_order_prepaid(
     member_discount = flying_pass_discount_amount(base_prepaid, resolved_tier)
     auto_prepaid = max(int(base_prepaid) - member_discount, 0)
 
-    if submitted_prepaid_amount is None:
-        if order.staff_prepaid_override_amount is None:
-            resolved_prepaid = auto_prepaid
-            override_amount = None
-        else:
-            resolved_prepaid = max(int(order.staff_prepaid_override_amount), 0)
-            override_amount = resolved_prepaid if resolved_prepaid != auto_prepaid else None
-    else:
+    # Precedence: staff-submitted amount, then stored override, then auto
+    if submitted_prepaid_amount is not None:
         resolved_prepaid = max(int(submitted_prepaid_amount), 0)
-        override_amount = resolved_prepaid if resolved_prepaid != auto_prepaid else None
+    elif order.staff_prepaid_override_amount is not None:
+        resolved_prepaid = max(int(order.staff_prepaid_override_amount), 0)
+    else:
+        resolved_prepaid = auto_prepaid
+    override_amount = resolved_prepaid if resolved_prepaid != auto_prepaid else None
 
     order.expected_storage_days = resolved_days
     order.discount_rate = discount_rate
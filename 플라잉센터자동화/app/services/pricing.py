@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 SUITCASE_DAILY_RATE = 800
@@ -6,7 +8,8 @@ BACKPACK_DAILY_RATE = 500
 SET_DAILY_RATE = 1200
 
 
-@dataclass
+# Frozen so cached results can be shared between callers safely
+@dataclass(frozen=True)
 class PricingResult:
     suitcase_qty: int
     backpack_qty: int
@@ -14,6 +17,7 @@ class PricingResult:
     price_per_day: int
 
 
+@lru_cache(maxsize=64)
 def calculate_price_per_day(suitcase_qty: int, backpack_qty: int) -> PricingResult:
     if suitcase_qty < 0 or backpack_qty < 0:
         raise ValueError("Baggage quantities cannot be negative.")
@@ -33,16 +37,14 @@ def calculate_price_per_day(suitcase_qty: int, backpack_qty: int) -> PricingResu
     )
 
 
+# Tier thresholds (inclusive) and the rate that applies once each is reached
+_DISCOUNT_DAY_THRESHOLDS = (7, 14, 30, 60)
+_DISCOUNT_RATES = (0.0, 0.05, 0.10, 0.15, 0.20)
+
+
+@lru_cache(maxsize=128)
 def discount_rate_for_days(storage_days: int) -> float:
-    if storage_days >= 60:
-        return 0.20
-    if storage_days >= 30:
-        return 0.15
-    if storage_days >= 14:
-        return 0.10
-    if storage_days >= 7:
-        return 0.05
-    return 0.0
+    return _DISCOUNT_RATES[bisect_right(_DISCOUNT_DAY_THRESHOLDS, storage_days)]
 
 
 def calculate_prepaid_amount(price_per_day: int, expected_storage_days: int) -> tuple[float, int]:
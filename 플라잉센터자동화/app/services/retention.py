@@ -9,10 +9,10 @@ from app.r2 import r2_delete
 from app.supabase_client import SupabaseDB
 
 
-def _safe_r2_delete(path: str) -> None:
+def _safe_r2_delete(paths: list[str]) -> None:
+    """Best-effort batch delete: cleanup must not abort on storage errors."""
     try:
-        if path:
-            r2_delete([path])
+        r2_delete([path for path in paths if path])
     except Exception:
         pass
 
@@ -28,24 +28,23 @@ def run_retention_cleanup(db: SupabaseDB) -> dict[str, int]:
 
     image_expired_orders = db.query("orders").filter(("created_at", "<", image_threshold)).all()
     for order in image_expired_orders:
-        changed = False
+        # Batch the order's images into one delete call so r2_delete can run
+        # them concurrently instead of one blocking request per path
+        expired_paths = []
         if order.id_image_url:
-            _safe_r2_delete(order.id_image_url)
-            image_deleted += 1
+            expired_paths.append(order.id_image_url)
             order.id_image_url = ""
-            changed = True
         if order.luggage_image_url:
-            _safe_r2_delete(order.luggage_image_url)
-            image_deleted += 1
+            expired_paths.append(order.luggage_image_url)
             order.luggage_image_url = ""
-            changed = True
-        if changed:
+        if expired_paths:
+            _safe_r2_delete(expired_paths)
+            image_deleted += len(expired_paths)
             db.update(order)
 
     old_orders = db.query("orders").filter(("created_at", "<", order_threshold)).all()
     for order in old_orders:
-        _safe_r2_delete(order.id_image_url or "")
-        _safe_r2_delete(order.luggage_image_url or "")
+        _safe_r2_delete([order.id_image_url or "", order.luggage_image_url or ""])
 
         audit_deleted += db.delete_where(
             "audit_logs", [("order_id", "=", order.order_id)]
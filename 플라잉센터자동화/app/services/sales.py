@@ -1,6 +1,8 @@
 """Sales analytics: order revenue summaries and period reporting."""
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import HTTPException
 
 from app.supabase_client import SupabaseDB
@@ -9,100 +11,49 @@ from app.utils import (
     date_to_ymd,
     iter_business_dates,
     parse_business_date_value,
-    to_jst_datetime,
 )
 
 
-def summarize_order_sales_for_date(db: SupabaseDB, business_date: str) -> dict[str, int]:
+def summarize_order_sales_and_discount_for_date(db: SupabaseDB, business_date: str) -> dict[str, int]:
+    """Cash/QR totals and pass discount for one business day in a single query."""
     start_utc, end_utc = business_date_range_utc(business_date)
     orders = (
         db.query("orders")
+        .select("prepaid_amount,payment_method,flying_pass_discount_amount")
         .filter(
             ("created_at", ">=", start_utc),
             ("created_at", "<", end_utc),
             ("status", "IN", ["PAID", "PICKED_UP"]),
         )
-        .all()
+        .all_dicts()
     )
 
     cash_amount = 0
     qr_amount = 0
+    pass_discount_total = 0
     for order in orders:
-        amount = int(order.prepaid_amount or 0)
-        if order.payment_method == "CASH":
+        amount = int(order["prepaid_amount"] or 0)
+        if order["payment_method"] == "CASH":
             cash_amount += amount
-        elif order.payment_method == "PAY_QR":
+        elif order["payment_method"] == "PAY_QR":
             qr_amount += amount
+        pass_discount_total += max(int(order["flying_pass_discount_amount"] or 0), 0)
 
     return {
         "cash_amount": cash_amount,
         "qr_amount": qr_amount,
         "sales_total_amount": cash_amount + qr_amount,
+        "pass_discount_total": pass_discount_total,
     }
 
 
 def summarize_order_pass_discount_for_date(db: SupabaseDB, business_date: str) -> int:
     start_utc, end_utc = business_date_range_utc(business_date)
-    rows = (
-        db.query("orders")
-        .filter(
-            ("created_at", ">=", start_utc),
-            ("created_at", "<", end_utc),
-            ("status", "IN", ["PAID", "PICKED_UP"]),
-        )
-        .all()
-    )
-    return sum(max(int(row.flying_pass_discount_amount or 0), 0) for row in rows)
-
-
-def summarize_luggage_sales_for_period(
-    db: SupabaseDB,
-    start_date: str,
-    end_date: str,
-) -> dict[str, dict[str, int]]:
-    start_date_value = parse_business_date_value(start_date)
-    end_date_value = parse_business_date_value(end_date)
-    if end_date_value < start_date_value:
-        raise HTTPException(status_code=400, detail="End date must be on or after start date.")
-
-    start_utc, _ = business_date_range_utc(start_date)
-    _, end_exclusive_utc = business_date_range_utc(date_to_ymd(end_date_value))
-
-    orders = (
-        db.query("orders")
-        .filter(
-            ("created_at", ">=", start_utc),
-            ("created_at", "<", end_exclusive_utc),
-            ("status", "IN", ["PAID", "PICKED_UP"]),
-        )
-        .all()
-    )
-
-    by_date: dict[str, dict[str, int]] = {}
-    for order in orders:
-        business_date = to_jst_datetime(order.created_at).strftime("%Y-%m-%d")
-        entry = by_date.setdefault(
-            business_date,
-            {
-                "luggage_revenue": 0,
-                "luggage_customers": 0,
-                "luggage_cash": 0,
-                "luggage_qr": 0,
-                "luggage_orders": 0,
-            },
-        )
-        amount = max(int(order.prepaid_amount or 0), 0)
-        customer_count = max(int(order.companion_count or 1), 1)
-
-        entry["luggage_revenue"] += amount
-        entry["luggage_customers"] += customer_count
-        entry["luggage_orders"] += 1
-        if order.payment_method == "CASH":
-            entry["luggage_cash"] += amount
-        elif order.payment_method == "PAY_QR":
-            entry["luggage_qr"] += amount
-
-    return by_date
+    # Summed DB-side: one scalar crosses the wire instead of a row per order
+    return int(db.rpc("luggage_pass_discount_total", {
+        "p_start": start_utc.isoformat(),
+        "p_end": end_utc.isoformat(),
+    }) or 0)
 
 
 def build_sales_analytics(
@@ -116,29 +67,72 @@ def build_sales_analytics(
         raise HTTPException(status_code=400, detail="End date must be on or after start date.")
 
     business_dates = iter_business_dates(start_date_value, end_date_value)
-    luggage_by_date = summarize_luggage_sales_for_period(db, start_date, end_date)
 
-    rental_rows = (
+    start_utc, _ = business_date_range_utc(start_date)
+    _, end_exclusive_utc = business_date_range_utc(date_to_ymd(end_date_value))
+    rental_query = (
         db.query("rental_daily_sales")
+        .select("business_date,revenue_amount,customer_count")
         .filter(
             ("business_date", ">=", start_date),
             ("business_date", "<=", end_date),
         )
-        .all()
     )
-    rental_by_date: dict[str, dict[str, int]] = {}
-    for row in rental_rows:
-        entry = rental_by_date.setdefault(
-            row.business_date,
-            {
-                "rental_revenue": 0,
-                "rental_customers": 0,
-            },
+
+    def _fetch_sales_by_date() -> list[dict]:
+        # Aggregated DB-side: one row per business day instead of per order
+        return db.rpc("luggage_sales_by_date", {
+            "p_start": start_utc.isoformat(),
+            "p_end": end_exclusive_utc.isoformat(),
+        })
+
+    async def _fetch_both() -> tuple[list, list]:
+        # The two REST round trips are independent; overlap them so the
+        # endpoint waits for the slower one instead of the sum of both
+        return await asyncio.gather(
+            asyncio.to_thread(_fetch_sales_by_date),
+            asyncio.to_thread(rental_query.all_dicts),
         )
-        entry["rental_revenue"] += max(int(row.revenue_amount or 0), 0)
-        entry["rental_customers"] += max(int(row.customer_count or 0), 0)
+
+    sales_rows, rental_rows = asyncio.run(_fetch_both())
+
+    luggage_by_date: dict[str, dict[str, int]] = {
+        business_date: {
+            "luggage_revenue": 0,
+            "luggage_customers": 0,
+            "luggage_cash": 0,
+            "luggage_qr": 0,
+            "luggage_orders": 0,
+        }
+        for business_date in business_dates
+    }
+    for sales_row in sales_rows:
+        entry = luggage_by_date[sales_row["business_date"]]
+        entry["luggage_revenue"] = int(sales_row["luggage_revenue"] or 0)
+        entry["luggage_customers"] = int(sales_row["luggage_customers"] or 0)
+        entry["luggage_cash"] = int(sales_row["luggage_cash"] or 0)
+        entry["luggage_qr"] = int(sales_row["luggage_qr"] or 0)
+        entry["luggage_orders"] = int(sales_row["luggage_orders"] or 0)
+
+    rental_by_date: dict[str, dict[str, int]] = {
+        business_date: {
+            "rental_revenue": 0,
+            "rental_customers": 0,
+        }
+        for business_date in business_dates
+    }
+    for row in rental_rows:
+        entry = rental_by_date[row["business_date"]]
+        entry["rental_revenue"] += max(int(row["revenue_amount"] or 0), 0)
+        entry["rental_customers"] += max(int(row["customer_count"] or 0), 0)
 
     daily_rows: list[dict[str, object]] = []
+    # Chart arrays are filled alongside the row dicts so the range is walked
+    # once instead of once per series
+    daily_labels: list[str] = []
+    daily_luggage: list[int] = []
+    daily_rental: list[int] = []
+    daily_combined: list[int] = []
     totals = {
         "luggage_revenue": 0,
         "rental_revenue": 0,
@@ -152,23 +146,8 @@ def build_sales_analytics(
     monthly_map: dict[str, dict[str, int]] = {}
 
     for business_date in business_dates:
-        luggage = luggage_by_date.get(
-            business_date,
-            {
-                "luggage_revenue": 0,
-                "luggage_customers": 0,
-                "luggage_cash": 0,
-                "luggage_qr": 0,
-                "luggage_orders": 0,
-            },
-        )
-        rental = rental_by_date.get(
-            business_date,
-            {
-                "rental_revenue": 0,
-                "rental_customers": 0,
-            },
-        )
+        luggage = luggage_by_date[business_date]
+        rental = rental_by_date[business_date]
 
         combined_revenue = luggage["luggage_revenue"] + rental["rental_revenue"]
         daily_rows.append(
@@ -184,6 +163,10 @@ def build_sales_analytics(
                 "luggage_orders": luggage["luggage_orders"],
             }
         )
+        daily_labels.append(business_date)
+        daily_luggage.append(luggage["luggage_revenue"])
+        daily_rental.append(rental["rental_revenue"])
+        daily_combined.append(combined_revenue)
 
         totals["luggage_revenue"] += luggage["luggage_revenue"]
         totals["rental_revenue"] += rental["rental_revenue"]
@@ -211,17 +194,28 @@ def build_sales_analytics(
         month_entry["luggage_customers"] += luggage["luggage_customers"]
         month_entry["rental_customers"] += rental["rental_customers"]
 
-    monthly_rows = [
-        {
-            "month": month,
-            "luggage_revenue": values["luggage_revenue"],
-            "rental_revenue": values["rental_revenue"],
-            "combined_revenue": values["combined_revenue"],
-            "luggage_customers": values["luggage_customers"],
-            "rental_customers": values["rental_customers"],
-        }
-        for month, values in sorted(monthly_map.items())
-    ]
+    monthly_rows: list[dict[str, object]] = []
+    monthly_labels: list[str] = []
+    monthly_luggage: list[int] = []
+    monthly_rental: list[int] = []
+    monthly_combined: list[int] = []
+    # business_dates is ascending, so months were inserted in order and
+    # the dict already iterates sorted
+    for month, values in monthly_map.items():
+        monthly_rows.append(
+            {
+                "month": month,
+                "luggage_revenue": values["luggage_revenue"],
+                "rental_revenue": values["rental_revenue"],
+                "combined_revenue": values["combined_revenue"],
+                "luggage_customers": values["luggage_customers"],
+                "rental_customers": values["rental_customers"],
+            }
+        )
+        monthly_labels.append(month)
+        monthly_luggage.append(values["luggage_revenue"])
+        monthly_rental.append(values["rental_revenue"])
+        monthly_combined.append(values["combined_revenue"])
 
     day_count = len(business_dates)
     avg_daily_revenue = round(totals["combined_revenue"] / day_count) if day_count else 0
@@ -230,14 +224,14 @@ def build_sales_analytics(
     )
 
     chart = {
-        "daily_labels": [row["business_date"] for row in daily_rows],
-        "daily_luggage": [row["luggage_revenue"] for row in daily_rows],
-        "daily_rental": [row["rental_revenue"] for row in daily_rows],
-        "daily_combined": [row["combined_revenue"] for row in daily_rows],
-        "monthly_labels": [row["month"] for row in monthly_rows],
-        "monthly_luggage": [row["luggage_revenue"] for row in monthly_rows],
-        "monthly_rental": [row["rental_revenue"] for row in monthly_rows],
-        "monthly_combined": [row["combined_revenue"] for row in monthly_rows],
+        "daily_labels": daily_labels,
+        "daily_luggage": daily_luggage,
+        "daily_rental": daily_rental,
+        "daily_combined": daily_combined,
+        "monthly_labels": monthly_labels,
+        "monthly_luggage": monthly_luggage,
+        "monthly_rental": monthly_rental,
+        "monthly_combined": monthly_combined,
     }
 
     return {
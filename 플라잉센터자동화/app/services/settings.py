@@ -1,27 +1,54 @@
 """App settings: read/write helpers for the app_settings table."""
 from __future__ import annotations
 
+import time
+from typing import Optional
+
 from app.supabase_client import SupabaseDB
 
 
+# Settings are read on many request paths but change rarely, so a short TTL
+# turns most reads into a dict lookup. Writes invalidate their key immediately.
+_SETTING_CACHE_TTL_SECONDS = 30.0
+_setting_cache: dict[str, tuple[float, Optional[str]]] = {}
+
+
+def invalidate_app_setting_cache(setting_key: Optional[str] = None) -> None:
+    if setting_key is None:
+        _setting_cache.clear()
+    else:
+        _setting_cache.pop(setting_key, None)
+
+
 def get_app_setting(db: SupabaseDB, setting_key: str, default_value: str) -> str:
+    cached = _setting_cache.get(setting_key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1] or default_value
     row = db.query("app_settings").filter(("setting_key", "=", setting_key)).first()
-    if row is None:
-        return default_value
-    return row.setting_value or default_value
+    stored = row.setting_value if row is not None else None
+    # Cache the stored value, not the resolved one: callers pass different defaults
+    _setting_cache[setting_key] = (time.monotonic() + _SETTING_CACHE_TTL_SECONDS, stored)
+    return stored or default_value
+
+
+def get_app_settings_bulk(db: SupabaseDB, setting_keys: list[str]) -> dict[str, str]:
+    """Fetch several settings in one query; keys with no stored value are omitted."""
+    rows = (
+        db.query("app_settings")
+        .select("setting_key,setting_value")
+        .filter(("setting_key", "IN", setting_keys))
+        .all()
+    )
+    return {row.setting_key: row.setting_value for row in rows if row.setting_value}
 
 
 def upsert_app_setting(db: SupabaseDB, setting_key: str, setting_value: str, staff_id: str):
-    row = db.query("app_settings").filter(("setting_key", "=", setting_key)).first()
-    normalized_value = setting_value.strip()
-    if row is None:
-        return db.insert("app_settings", {
-            "setting_key": setting_key,
-            "setting_value": normalized_value,
-            "staff_id": staff_id,
-        })
-    else:
-        row.setting_value = normalized_value
-        row.staff_id = staff_id
-        db.update(row)
-        return row
+    # setting_key is UNIQUE, so one INSERT ... ON CONFLICT round trip replaces
+    # the old read-then-insert-or-update pair
+    row = db.upsert("app_settings", {
+        "setting_key": setting_key,
+        "setting_value": setting_value.strip(),
+        "staff_id": staff_id,
+    }, on_conflict="setting_key")
+    invalidate_app_setting_cache(setting_key)
+    return row
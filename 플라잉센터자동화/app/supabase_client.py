@@ -5,11 +5,33 @@ All luggage tables are accessed with 'luggage_' prefix.
 Staff auth uses center-dashboard's user_profiles table (no prefix).
 """
 from __future__ import annotations
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Optional
+import httpx as _httpx
+import orjson as _orjson
 import supabase as _supabase
 
 
+_stdlib_response_json = _httpx.Response.json
+
+
+def _orjson_response_json(self, **kwargs: Any) -> Any:
+    if kwargs:
+        # Caller wants stdlib decoder options (object_hook etc.)
+        return _stdlib_response_json(self, **kwargs)
+    return _orjson.loads(self.content)
+
+
+# postgrest decodes every PostgREST response through httpx.Response.json(),
+# which uses the stdlib json module. orjson parses the array-of-objects
+# payloads list queries return several times faster, and its JSONDecodeError
+# subclasses json.JSONDecodeError so postgrest's empty-body fallback still
+# works.
+_httpx.Response.json = _orjson_response_json
+
+
 # Tables that don't get the luggage_ prefix (shared with center-dashboard)
 _NO_PREFIX: frozenset[str] = frozenset({"user_profiles", "login_logs", "activity_logs"})
 
@@ -47,25 +69,65 @@ def _utc_now() -> str:
 
 
 def _serialize(data: dict) -> dict:
-    """Convert datetime values to ISO 8601 strings for Supabase JSON serialization."""
-    out = {}
-    for k, v in data.items():
-        if isinstance(v, datetime):
-            out[k] = v.isoformat()
-        else:
-            out[k] = v
-    return out
-
+    """Convert datetime values to ISO 8601 strings for Supabase JSON serialization.
 
-def _full_table(name: str) -> str:
-    """Return the actual Supabase table name (with luggage_ prefix if needed)."""
-    if name in _NO_PREFIX:
-        return name
-    return f"luggage_{name}"
-
-
-def _pk_for(full_table: str) -> str:
-    return _PK_MAP.get(full_table, "id")
+    Most writes carry only JSON primitives; in that case the original dict is
+    returned as-is (callers must not mutate the result).
+    """
+    if not any(isinstance(v, datetime) for v in data.values()):
+        return data
+    return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in data.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class TableMeta:
+    """Resolved per-table facts: real name, primary key, updated_at handling."""
+    full_name: str
+    pk_col: str
+    auto_updated: bool
+
+
+_META: dict[str, TableMeta] = {}
+
+
+def _meta_for(table: str) -> TableMeta:
+    """One cached lookup per logical table name instead of prefix/pk/auto
+    checks against three separate maps on every operation."""
+    meta = _META.get(table)
+    if meta is None:
+        full = table if table in _NO_PREFIX else f"luggage_{table}"
+        meta = _META[table] = TableMeta(full, _PK_MAP.get(full, "id"), full in _AUTO_UPDATED)
+    return meta
+
+
+# Per-table column → bit index, grown lazily on first assignment. Row dirty
+# tracking is a bitmask int so repeated row.x = y edits cost a bitwise OR
+# instead of set insertion, and update() walks only the set bits.
+_COLUMN_BITS: dict[str, dict[str, int]] = {}
+_COLUMN_NAMES: dict[str, list[str]] = {}
+_COLUMN_BITS_LOCK = threading.Lock()
+
+
+def _column_bit(table: str, name: str) -> int:
+    # Lock-free fast path once a column's bit exists
+    bits = _COLUMN_BITS.get(table)
+    if bits is not None:
+        bit = bits.get(name)
+        if bit is not None:
+            return bit
+    # Allocation must be serialized: handler threads assigning new columns
+    # concurrently could otherwise hand the same bit to two columns, and
+    # update() would then write values under the wrong column names
+    with _COLUMN_BITS_LOCK:
+        bits = _COLUMN_BITS.get(table)
+        if bits is None:
+            bits = _COLUMN_BITS[table] = {}
+            _COLUMN_NAMES[table] = []
+        bit = bits.get(name)
+        if bit is None:
+            bit = bits[name] = 1 << len(bits)
+            _COLUMN_NAMES[table].append(name)
+        return bit
 
 
 class Row:
@@ -77,7 +139,7 @@ class Row:
         object.__setattr__(self, "_full_table", full_table)
         object.__setattr__(self, "_pk_col", pk_col)
         object.__setattr__(self, "_data", dict(data))
-        object.__setattr__(self, "_dirty", set())
+        object.__setattr__(self, "_dirty", 0)
 
     def __getattr__(self, name: str) -> Any:
         data = object.__getattribute__(self, "_data")
@@ -98,9 +160,11 @@ class Row:
 
     def __setattr__(self, name: str, value: Any) -> None:
         data = object.__getattribute__(self, "_data")
-        dirty = object.__getattribute__(self, "_dirty")
         data[name] = value
-        dirty.add(name)
+        dirty = object.__getattribute__(self, "_dirty")
+        bit = _column_bit(object.__getattribute__(self, "_table"), name)
+        if not dirty & bit:
+            object.__setattr__(self, "_dirty", dirty | bit)
 
     def __repr__(self) -> str:
         return f"Row({object.__getattribute__(self, '_table')}, {object.__getattribute__(self, '_data')})"
@@ -112,12 +176,19 @@ class SupabaseQuery:
     def __init__(self, db: "SupabaseDB", table: str) -> None:
         self._db = db
         self._table = table
-        self._full_table = _full_table(table)
-        self._pk_col = _pk_for(self._full_table)
+        meta = _meta_for(table)
+        self._full_table = meta.full_name
+        self._pk_col = meta.pk_col
         self._conditions: list = []  # list of (col, op, val) OR [list of (col,op,val)] for OR groups
         self._order_cols: list[str] = []
         self._limit_val: Optional[int] = None
         self._offset_val: Optional[int] = None
+        self._select_cols: str = "*"
+
+    def select(self, columns: str) -> "SupabaseQuery":
+        """Column projection or PostgREST embed: select("col1,col2,other_table!fk(col)")"""
+        self._select_cols = columns
+        return self
 
     def filter(self, *conditions: tuple) -> "SupabaseQuery":
         """AND conditions: filter(("col", "=", val), ("col2", "IN", [1,2]))"""
@@ -208,13 +279,24 @@ class SupabaseQuery:
         return q
 
     def all(self) -> list[Row]:
-        q = self._db.client.table(self._full_table).select("*")
+        q = self._db.client.table(self._full_table).select(self._select_cols)
         q = self._apply(q)
         result = q.execute()
         return [Row(self._table, self._full_table, self._pk_col, row) for row in result.data]
 
+    def all_dicts(self) -> list[dict]:
+        """Raw result dicts without Row wrapping.
+
+        For read-only hot loops: d["col"] is a C-level lookup, while Row
+        attribute access goes through __getattr__ on every read. Use all()
+        when dirty tracking for update() is needed.
+        """
+        q = self._db.client.table(self._full_table).select(self._select_cols)
+        q = self._apply(q)
+        return q.execute().data
+
     def first(self) -> Optional[Row]:
-        q = self._db.client.table(self._full_table).select("*")
+        q = self._db.client.table(self._full_table).select(self._select_cols)
         q = self._apply(q)
         q = q.limit(1)
         result = q.execute()
@@ -244,9 +326,28 @@ class SupabaseDB:
     def __init__(self, url: str, service_role_key: str) -> None:
         self.client = _supabase.create_client(url, service_role_key)
 
-    def get(self, table: str, pk_col: str, pk_val: Any) -> Optional[Row]:
-        full = _full_table(table)
-        result = self.client.table(full).select("*").eq(pk_col, pk_val).limit(1).execute()
+    def get(self, table: str, pk_col: str, pk_val: Any, select: str = "*") -> Optional[Row]:
+        """Fetch one row; pass select="col1,col2" to project only what's needed."""
+        full = _meta_for(table).full_name
+        result = self.client.table(full).select(select).eq(pk_col, pk_val).limit(1).execute()
+        if not result.data:
+            return None
+        return Row(table, full, pk_col, result.data[0])
+
+    def get_with_embed(self, table: str, pk_col: str, pk_val: Any, embed: str) -> Optional[Row]:
+        """Fetch one row plus an embedded relation in a single REST call.
+
+        embed uses PostgREST syntax, e.g. "staff:user_profiles!staff_id(id,username)".
+        The embedded resource is exposed as a plain dict attribute on the Row.
+        """
+        full = _meta_for(table).full_name
+        result = (
+            self.client.table(full)
+            .select(f"*,{embed}")
+            .eq(pk_col, pk_val)
+            .limit(1)
+            .execute()
+        )
         if not result.data:
             return None
         return Row(table, full, pk_col, result.data[0])
@@ -254,18 +355,37 @@ class SupabaseDB:
     def query(self, table: str) -> SupabaseQuery:
         return SupabaseQuery(self, table)
 
+    def rpc(self, name: str, params: dict) -> Any:
+        """Call a Postgres function through PostgREST and return its data."""
+        return self.client.rpc(name, params).execute().data
+
     def insert(self, table: str, data: dict) -> Row:
-        full = _full_table(table)
-        pk_col = _pk_for(full)
+        meta = _meta_for(table)
+        full, pk_col = meta.full_name, meta.pk_col
         # Remove None pk values so DB generates them; serialize datetime → ISO string
         cleaned = _serialize({k: v for k, v in data.items() if not (k == pk_col and v is None)})
         result = self.client.table(full).insert(cleaned).execute()
         return Row(table, full, pk_col, result.data[0])
 
+    def insert_many(self, table: str, rows: list[dict]) -> list[Row]:
+        """Insert several rows in one request. PostgREST accepts a JSON array."""
+        if not rows:
+            return []
+        meta = _meta_for(table)
+        full, pk_col = meta.full_name, meta.pk_col
+        cleaned = [
+            _serialize({k: v for k, v in row.items() if not (k == pk_col and v is None)})
+            for row in rows
+        ]
+        result = self.client.table(full).insert(cleaned).execute()
+        return [Row(table, full, pk_col, row) for row in result.data]
+
     def upsert(self, table: str, data: dict, on_conflict: str = "") -> Row:
-        full = _full_table(table)
-        pk_col = _pk_for(full)
+        meta = _meta_for(table)
+        full, pk_col = meta.full_name, meta.pk_col
         cleaned = _serialize(data)
+        if meta.auto_updated and "updated_at" not in cleaned:
+            cleaned = {**cleaned, "updated_at": _utc_now()}
         conflict_col = on_conflict or pk_col
         result = self.client.table(full).upsert(cleaned, on_conflict=conflict_col).execute()
         return Row(table, full, pk_col, result.data[0])
@@ -280,19 +400,26 @@ class SupabaseDB:
         data = object.__getattribute__(row, "_data")
         pk_val = data[pk_col]
 
-        dirty_data: dict = _serialize({k: data[k] for k in dirty})
-        if full in _AUTO_UPDATED:
+        names = _COLUMN_NAMES[table]
+        dirty_cols: dict = {}
+        while dirty:
+            low_bit = dirty & -dirty
+            name = names[low_bit.bit_length() - 1]
+            dirty_cols[name] = data[name]
+            dirty ^= low_bit
+        dirty_data: dict = _serialize(dirty_cols)
+        if _meta_for(table).auto_updated:
             dirty_data.setdefault("updated_at", _utc_now())
 
         self.client.table(full).update(dirty_data).eq(pk_col, pk_val).execute()
-        object.__setattr__(row, "_dirty", set())
+        object.__setattr__(row, "_dirty", 0)
 
     def delete_row(self, table: str, pk_col: str, pk_val: Any) -> None:
-        full = _full_table(table)
+        full = _meta_for(table).full_name
         self.client.table(full).delete().eq(pk_col, pk_val).execute()
 
     def delete_where(self, table: str, conditions: list[tuple]) -> int:
-        full = _full_table(table)
+        full = _meta_for(table).full_name
         q = self.client.table(full).delete()
         for col, op, val in conditions:
             if op == "=":
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 from app.config import JST
@@ -19,9 +20,40 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _parse_supabase_utc_timestamp(value: str) -> Optional[datetime]:
+    # Fast path for PostgREST's fixed layout:
+    # YYYY-MM-DDTHH:MM:SS[.f{1,6}](+00:00|Z). Slicing fixed offsets beats
+    # fromisoformat, which must accept every valid ISO 8601 form.
+    try:
+        if value[4] != "-" or value[10] != "T" or value[13] != ":" or value[16] != ":":
+            return None
+        if value.endswith("+00:00"):
+            core = value[:-6]
+        elif value.endswith("Z"):
+            core = value[:-1]
+        else:
+            return None
+        microsecond = 0
+        if len(core) > 19:
+            frac = core[20:]
+            if core[19] != "." or not frac or len(frac) > 6 or not frac.isdigit():
+                return None
+            microsecond = int(frac.ljust(6, "0"))
+        return datetime(
+            int(core[:4]), int(core[5:7]), int(core[8:10]),
+            int(core[11:13]), int(core[14:16]), int(core[17:19]),
+            microsecond, tzinfo=timezone.utc,
+        )
+    except (ValueError, IndexError):
+        return None
+
+
 def ensure_utc_datetime(dt) -> datetime:
     # Supabase REST API returns TIMESTAMPTZ columns as ISO 8601 strings
     if isinstance(dt, str):
+        parsed = _parse_supabase_utc_timestamp(dt)
+        if parsed is not None:
+            return parsed
         # Python <3.11 requires exactly 0, 3, or 6 fractional digits.
         # Supabase may return 5 digits — pad to 6 for compatibility.
         import re
@@ -40,7 +72,10 @@ def to_jst_datetime(dt: datetime) -> datetime:
     return ensure_utc_datetime(dt).astimezone(JST)
 
 
+@lru_cache(maxsize=128)
 def parse_pickup_datetime(local_datetime_str: str) -> datetime:
+    # Pure str→datetime mapping; cached because handlers parse the same raw
+    # value several times per request (failures raise and are never cached).
     from fastapi import HTTPException
 
     try:
@@ -92,18 +127,15 @@ def parse_business_date_value(value: str) -> date:
 
 
 def date_to_ymd(value: date) -> str:
-    return value.strftime("%Y-%m-%d")
+    # isoformat() is "YYYY-MM-DD" for dates and skips strftime's format parsing
+    return value.isoformat()
 
 
 def iter_business_dates(start_date: date, end_date: date) -> list[str]:
     if end_date < start_date:
         return []
-    cursor = start_date
-    values: list[str] = []
-    while cursor <= end_date:
-        values.append(date_to_ymd(cursor))
-        cursor += timedelta(days=1)
-    return values
+    day_count = (end_date - start_date).days + 1
+    return [(start_date + timedelta(days=offset)).isoformat() for offset in range(day_count)]
 
 
 def auto_pickup_note(created_at: datetime, expected_pickup_at: datetime) -> str:
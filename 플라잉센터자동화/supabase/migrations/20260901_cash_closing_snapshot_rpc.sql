@@ -0,0 +1,42 @@
+-- One round trip for the cash closing write path: aggregate the day's order
+-- sales and report any existing closing for (business_date, closing_type).
+-- Business dates are JST days, matching business_date_range_utc in app/utils.py.
+CREATE OR REPLACE FUNCTION cash_closing_snapshot(
+    p_business_date TEXT,
+    p_closing_type TEXT
+) RETURNS JSON
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_start TIMESTAMPTZ;
+    v_end TIMESTAMPTZ;
+    v_cash_amount BIGINT;
+    v_qr_amount BIGINT;
+    v_existing_closing_id BIGINT;
+BEGIN
+    v_start := (p_business_date::TIMESTAMP) AT TIME ZONE 'Asia/Tokyo';
+    v_end := v_start + INTERVAL '1 day';
+
+    SELECT
+        COALESCE(SUM(prepaid_amount) FILTER (WHERE payment_method = 'CASH'), 0),
+        COALESCE(SUM(prepaid_amount) FILTER (WHERE payment_method = 'PAY_QR'), 0)
+    INTO v_cash_amount, v_qr_amount
+    FROM luggage_orders
+    WHERE created_at >= v_start
+      AND created_at < v_end
+      AND status IN ('PAID', 'PICKED_UP');
+
+    SELECT closing_id
+    INTO v_existing_closing_id
+    FROM luggage_cash_closings
+    WHERE business_date = p_business_date
+      AND closing_type = p_closing_type
+    LIMIT 1;
+
+    RETURN json_build_object(
+        'cash_amount', v_cash_amount,
+        'qr_amount', v_qr_amount,
+        'existing_closing_id', v_existing_closing_id
+    );
+END;
+$$;
@@ -0,0 +1,90 @@
+-- Atomic submit / verify-lock for cash closings.
+-- Each function updates the closing row and inserts its audit entry in one
+-- transaction, replacing two sequential REST writes from the app.
+
+CREATE OR REPLACE FUNCTION submit_cash_closing(
+  p_closing_id BIGINT,
+  p_staff_id TEXT
+) RETURNS SETOF luggage_cash_closings AS $$
+DECLARE
+  v_row luggage_cash_closings;
+BEGIN
+  UPDATE luggage_cash_closings SET
+    workflow_status = 'SUBMITTED',
+    submitted_by_staff_id = p_staff_id,
+    submitted_at = now(),
+    verified_by_staff_id = NULL,
+    verified_at = NULL,
+    check_cash_match = false,
+    check_qr_match = false,
+    check_pending_items = false,
+    check_handover_note = false,
+    staff_id = p_staff_id,
+    updated_at = now()
+  WHERE closing_id = p_closing_id
+  RETURNING * INTO v_row;
+
+  IF v_row.closing_id IS NULL THEN
+    RAISE EXCEPTION 'cash closing % not found', p_closing_id;
+  END IF;
+
+  INSERT INTO luggage_cash_closing_audits (closing_id, action, payload, staff_id, created_at)
+  VALUES (
+    p_closing_id,
+    'SUBMIT',
+    json_build_object(
+      'workflow_status', v_row.workflow_status,
+      'submitted_by_staff_id', v_row.submitted_by_staff_id
+    )::text,
+    p_staff_id,
+    now()
+  );
+
+  RETURN NEXT v_row;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION verify_lock_cash_closing(
+  p_closing_id BIGINT,
+  p_staff_id TEXT
+) RETURNS SETOF luggage_cash_closings AS $$
+DECLARE
+  v_row luggage_cash_closings;
+BEGIN
+  UPDATE luggage_cash_closings SET
+    workflow_status = 'LOCKED',
+    verified_by_staff_id = p_staff_id,
+    verified_at = now(),
+    check_cash_match = true,
+    check_qr_match = true,
+    check_pending_items = true,
+    check_handover_note = true,
+    staff_id = p_staff_id,
+    updated_at = now()
+  WHERE closing_id = p_closing_id
+  RETURNING * INTO v_row;
+
+  IF v_row.closing_id IS NULL THEN
+    RAISE EXCEPTION 'cash closing % not found', p_closing_id;
+  END IF;
+
+  INSERT INTO luggage_cash_closing_audits (closing_id, action, payload, staff_id, created_at)
+  VALUES (
+    p_closing_id,
+    'VERIFY_LOCK',
+    json_build_object(
+      'workflow_status', v_row.workflow_status,
+      'submitted_by_staff_id', v_row.submitted_by_staff_id,
+      'verified_by_staff_id', v_row.verified_by_staff_id,
+      'check_cash_match', true,
+      'check_qr_match', true,
+      'check_pending_items', true,
+      'check_handover_note', true
+    )::text,
+    p_staff_id,
+    now()
+  );
+
+  RETURN NEXT v_row;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,4 @@
+-- One cash closing per business date and type, enforced by the DB so the
+-- create path no longer needs a pre-check SELECT (and cannot race).
+CREATE UNIQUE INDEX IF NOT EXISTS uq_luggage_cash_closings_date_type
+    ON luggage_cash_closings(business_date, closing_type);
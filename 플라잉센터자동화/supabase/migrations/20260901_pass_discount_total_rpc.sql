@@ -0,0 +1,16 @@
+-- Sum flying-pass discounts DB-side so the cash-closing page fetches one
+-- scalar per business day instead of a row per order. Negative amounts are
+-- clamped to 0, matching the Python accumulation it replaces.
+CREATE OR REPLACE FUNCTION luggage_pass_discount_total(
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ
+) RETURNS BIGINT
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(GREATEST(COALESCE(flying_pass_discount_amount, 0), 0)), 0)
+    FROM luggage_orders
+    WHERE created_at >= p_start
+      AND created_at < p_end
+      AND status IN ('PAID', 'PICKED_UP')
+$$;
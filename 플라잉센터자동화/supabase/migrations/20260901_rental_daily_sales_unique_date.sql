@@ -0,0 +1,12 @@
+-- Enforce one rental sales row per business date at the DB level.
+-- Lets the app drop its duplicate pre-check query and rely on 23505 errors.
+
+-- The old application-side guard was racy, so historical duplicates may
+-- exist; keep only the newest row per date or the index cannot be built.
+DELETE FROM luggage_rental_daily_sales a
+USING luggage_rental_daily_sales b
+WHERE a.business_date = b.business_date
+  AND a.rental_id < b.rental_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_luggage_rental_daily_sales_business_date
+  ON luggage_rental_daily_sales(business_date);
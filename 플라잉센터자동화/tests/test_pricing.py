@@ -10,11 +10,10 @@ class PricingTest(unittest.TestCase):
         self.assertEqual(result.price_per_day, 2900)
 
     def test_discount_tiers(self):
-        self.assertEqual(discount_rate_for_days(6), 0.0)
-        self.assertEqual(discount_rate_for_days(7), 0.05)
-        self.assertEqual(discount_rate_for_days(14), 0.10)
-        self.assertEqual(discount_rate_for_days(30), 0.15)
-        self.assertEqual(discount_rate_for_days(60), 0.20)
+        tiers = [(6, 0.0), (7, 0.05), (14, 0.10), (30, 0.15), (60, 0.20)]
+        for days, expected in tiers:
+            with self.subTest(days=days):
+                self.assertEqual(discount_rate_for_days(days), expected)
 
     def test_prepaid_amount(self):
         discount, prepaid = calculate_prepaid_amount(1200, 10)
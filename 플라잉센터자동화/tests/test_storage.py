@@ -1,9 +1,13 @@
 import unittest
 from datetime import datetime, timezone
 
-from app.config import JST
 from app.services.storage import calculate_storage_days
 
+# UTC equivalents of 2026-02-19 09:00 / 2026-02-20 10:00 JST, precomputed so
+# the tests skip the per-run astimezone conversions
+NEXT_DAY_CREATED_UTC = datetime(2026, 2, 19, 0, 0, tzinfo=timezone.utc)
+NEXT_DAY_PICKUP_UTC = datetime(2026, 2, 20, 1, 0, tzinfo=timezone.utc)
+
 
 class StorageDayTest(unittest.TestCase):
     def test_same_day_is_one(self):
@@ -12,9 +16,7 @@ class StorageDayTest(unittest.TestCase):
         self.assertEqual(calculate_storage_days(created, pickup), 1)
 
     def test_next_day_is_two(self):
-        created = datetime(2026, 2, 19, 9, 0, tzinfo=JST).astimezone(timezone.utc)
-        pickup = datetime(2026, 2, 20, 10, 0, tzinfo=JST).astimezone(timezone.utc)
-        self.assertEqual(calculate_storage_days(created, pickup), 2)
+        self.assertEqual(calculate_storage_days(NEXT_DAY_CREATED_UTC, NEXT_DAY_PICKUP_UTC), 2)
 
 
 if __name__ == "__main__":